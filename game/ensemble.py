@@ -0,0 +1,225 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import random
+import numpy as np
+
+from .player import Player
+from .evolution import Evolution
+
+
+def _run_evolution(players: tuple[Player, ...], settings: dict,
+                   seed: int) -> dict[str, list]:
+    """Plays a single seeded evolutionary tournament (runs in a worker)"""
+    random.seed(seed)
+    np.random.seed(seed)
+    return Evolution(players, **settings).play()
+
+
+class _P2Quantile:
+
+    def __init__(self, p: float, shape: tuple[int, ...]):
+        """
+        P-square estimator (Jain & Chlamtac, 1985) of the 'p' quantile of
+        many streams at once, one per cell of an array of the given shape.
+        It keeps five markers per cell, whatever the number of observations.
+        """
+        self.p = p
+        self.count = 0
+        self.heights = np.zeros((5,) + shape)
+        self.positions = np.broadcast_to(
+            np.arange(5.0).reshape((5,) + (1,) * len(shape)), self.heights.shape).copy()
+        self.desired = np.array([0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0])
+        self.increments = np.array([0.0, p / 2, p, (1 + p) / 2, 1.0])
+
+
+    def add(self, x: np.ndarray) -> None:
+        """Adds one observation to every stream"""
+        q, n = self.heights, self.positions
+        if self.count < 5:
+            q[self.count] = x
+            self.count += 1
+            if self.count == 5:
+                q.sort(axis=0)
+            return
+        self.count += 1
+
+        np.minimum(q[0], x, out=q[0])
+        np.maximum(q[4], x, out=q[4])
+        n[1:4] += x < q[1:4]
+        n[4] += 1
+        self.desired += self.increments
+
+        for i in (1, 2, 3):
+            d = self.desired[i] - n[i]
+            move = ((d >= 1) & (n[i + 1] - n[i] > 1)) \
+                   | ((d <= -1) & (n[i - 1] - n[i] < -1))
+            if not move.any():
+                continue
+            s = np.sign(d)
+            parabolic = q[i] + s / (n[i + 1] - n[i - 1]) \
+                        * ((n[i] - n[i - 1] + s) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                           + (n[i + 1] - n[i] - s) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+            neighbor = np.where(s > 0, i + 1, i - 1)
+            q_neighbor = np.take_along_axis(q, neighbor[None], axis=0)[0]
+            n_neighbor = np.take_along_axis(n, neighbor[None], axis=0)[0]
+            linear = q[i] + s * (q_neighbor - q[i]) / (n_neighbor - n[i])
+            inside = (q[i - 1] < parabolic) & (parabolic < q[i + 1])
+            q[i] = np.where(move, np.where(inside, parabolic, linear), q[i])
+            n[i] = np.where(move, n[i] + s, n[i])
+
+
+    def value(self) -> np.ndarray:
+        """Current estimate of the quantile of every stream"""
+        if self.count < 5:
+            return np.quantile(self.heights[:max(self.count, 1)], self.p, axis=0)
+        return self.heights[2].copy()
+
+
+class EvolutionEnsemble:
+
+    def __init__(self, players: tuple[Player, ...],
+                       n_runs: int = 32,
+                       n_workers: int | None = None,
+                       seed: int | None = None,
+                       n_rounds: int = 100,
+                       error: float = 0.0,
+                       repetitions: int = 2,
+                       generations: int = 100,
+                       reproductivity: float = 0.05,
+                       initial_population: tuple[int, ...] | int = 100,
+                       quantiles: tuple[float, ...] = (0.05, 0.5, 0.95)):
+        """
+        Ensemble of independent evolutionary tournaments, played in parallel
+        with different seeds. Trajectories are aggregated as they arrive into
+        fixed-size accumulators per strategy and generation (running mean and
+        variance, extinction counter and a quantile sketch per quantile), so
+        memory does not depend on the number of runs nor on the population.
+
+        Parameters:
+            - players (tuple[Player, ...]): tuple of players that will play the
+         tournaments
+            - n_runs (int = 32): number of independent evolutionary tournaments
+            - n_workers (int | None = None): number of worker processes. If
+         None, one per CPU
+            - seed (int | None = None): master seed the seed of every run is
+         derived from
+            - quantiles (tuple[float, ...] = (0.05, 0.5, 0.95)): quantiles
+         (base 1) of the counts to estimate
+            - the rest of parameters are the ones of 'Evolution'
+        """
+
+        assert n_runs > 0, "'n_runs' should be greater than 0"
+
+        self.players = players
+        self.n_runs = n_runs
+        self.n_workers = n_workers
+        self.seeds = np.random.SeedSequence(seed).generate_state(n_runs).tolist()
+        self.settings = {"n_rounds": n_rounds,
+                         "error": error,
+                         "repetitions": repetitions,
+                         "generations": generations,
+                         "reproductivity": reproductivity,
+                         "initial_population": initial_population}
+
+        # Only used to resolve the population and to plot the results
+        self.evolution = Evolution(players, **self.settings)
+        self.names = [player.name for player in self.players]
+
+        # Accumulators indexed by [strategy, generation]: Welford's running
+        # mean and sum of squared deviations, number of runs in which the
+        # strategy was extinct, and a P-square sketch for each quantile
+        shape = (len(self.players), generations + 1)
+        self.mean = np.zeros(shape)
+        self.m2 = np.zeros(shape)
+        self.extinct = np.zeros(shape, dtype=np.int64)
+        self.sketches = {q: _P2Quantile(q, shape) for q in quantiles}
+        self.completed = 0
+
+
+    def add_run(self, count_evolution: dict[str, list]) -> None:
+        """
+        Adds the result of one evolutionary tournament to the aggregate
+
+        Parameters:
+            - count_evolution (dict[str, list]): the output of 'Evolution.play'
+        """
+        counts = np.array([count_evolution[name] for name in self.names],
+                          dtype=np.float64)
+        self.completed += 1
+        delta = counts - self.mean
+        self.mean += delta / self.completed
+        self.m2 += delta * (counts - self.mean)
+        self.extinct += counts == 0
+        for sketch in self.sketches.values():
+            sketch.add(counts)
+
+
+    def play(self, do_print: bool = False) -> dict[str, list]:
+        """
+        Main call of the class. Plays all the runs in a process pool and
+        aggregates them as they finish.
+
+        Parameters
+            - do_print (bool = False): if True, prints a line each time a run
+         finishes
+
+        Results:
+            - The mean 'count_evolution' over all the runs
+        """
+        with ProcessPoolExecutor(max_workers=self.n_workers) as executor:
+            futures = [executor.submit(_run_evolution, self.players,
+                                       self.settings, seed)
+                       for seed in self.seeds]
+            for future in as_completed(futures):
+                self.add_run(future.result())
+                if do_print:
+                    print(f"Run {self.completed}/{self.n_runs} finished")
+
+        return self.count_evolution
+
+
+    def _as_dict(self, values: np.ndarray) -> dict[str, list]:
+        return {name: row.tolist() for name, row in zip(self.names, values)}
+
+
+    @property
+    def count_evolution(self) -> dict[str, list]:
+        """Mean number of individuals of each strategy at each generation"""
+        return self._as_dict(self.mean)
+
+
+    def variance(self) -> dict[str, list]:
+        """
+        Sample variance of the number of individuals of each strategy at each
+        generation, across the runs
+        """
+        return self._as_dict(self.m2 / max(self.completed - 1, 1))
+
+
+    def quantile(self, q: float) -> dict[str, list]:
+        """
+        Estimated quantile (base 1) of the number of individuals of each
+        strategy at each generation, across the runs. 'q' must be one of the
+        'quantiles' given to the constructor
+        """
+        assert q in self.sketches, f"'q' should be one of {tuple(self.sketches)}"
+        return self._as_dict(self.sketches[q].value())
+
+
+    def extinction(self) -> dict[str, list]:
+        """
+        Probability (base 1) that each strategy has no individuals left at
+        each generation
+        """
+        return self._as_dict(self.extinct / max(self.completed, 1))
+
+
+    def stackplot(self, low: float = 0.05, high: float = 0.95) -> None:
+        """
+        Plots a 'stackplot' of the mean evolution, with the 'low' and 'high'
+        quantiles of each strategy drawn as bands (both must be among the
+        'quantiles' given to the constructor)
+        """
+        lows = self.quantile(low)
+        highs = self.quantile(high)
+        bands = {name: (lows[name], highs[name]) for name in self.names}
+        self.evolution.stackplot(self.count_evolution, bands)
@@ -4,8 +4,9 @@ import matplotlib.pyplot as plt
 import numpy as np
 
 from .player import Player
+from .tournament import Tournament
+from .payoff import PayoffMatrix
 
-# TODO: Fill in the methods below
 class Evolution:
 
     # Este método ya está implementado
@@ -15,7 +16,8 @@ class Evolution:
                        repetitions: int = 2,
                        generations: int = 100,
                        reproductivity: float = 0.05,
-                       initial_population: tuple[int, ...] | int = 100):
+                       initial_population: tuple[int, ...] | int = 100,
+                       payoff_matrix: PayoffMatrix | None = None):
         """
         Evolutionary tournament
 
@@ -33,6 +35,11 @@ class Evolution:
             - initial_population (tuple[int, ...] | int = 100): list of
          individuals representing each players (same index as 'players' tuple)
          OR total population size (int).
+            - payoff_matrix (PayoffMatrix | None = None): an already filled
+         payoff matrix of the players. If given, the fitness of each individual
+         is read from it instead of playing a tournament every generation. It
+         must have been filled with the same players (in the same order),
+         'n_rounds' and 'error'
         """
 
         self.players = players
@@ -41,6 +48,9 @@ class Evolution:
         self.repetitions = repetitions
         self.generations = generations
         self.reproductivity = reproductivity
+        self.payoff_matrix = payoff_matrix
+        if self.payoff_matrix is not None:
+            self.payoff_matrix.check(self.players, self.n_rounds, self.error)
 
         if isinstance(initial_population, int):
             self.initial_population = [math.floor(initial_population
@@ -58,7 +68,7 @@ class Evolution:
 
 
     def natural_selection(self, result_tournament: dict[Player, float]) \
-                          -> tuple[list,list]:
+                          -> dict[Player, float]:
         """
         Kill the worst guys, reproduce the top ones. Takes the ranking once a
         face-to-face tournament has been played and returns another ranking,
@@ -71,7 +81,11 @@ class Evolution:
             - Same kind of dict ranking as the input, but with the evolutionary
          dynamics applied
         """
-        raise NotImplementedError
+        ranking = sorted(result_tournament, key=result_tournament.get,
+                         reverse=True)
+        survivors = ranking[:len(ranking) - self.repr_int]
+        offspring = [copy.deepcopy(player) for player in ranking[:self.repr_int]]
+        return {player: 0.0 for player in survivors + offspring}
 
 
     def count_strategies(self) -> dict[str, int]:
@@ -85,10 +99,36 @@ class Evolution:
             - A dict, containing as values the name of the players and as
          values the number of individuals they have now alive in the tournament
         """
-        raise NotImplementedError
+        counts = {player.name: 0 for player in self.players}
+        for player in self.ranking:
+            counts[player.name] += 1
+        return counts
 
 
-    def play(self, do_print: bool = False):
+    def face_to_face(self) -> dict[Player, float]:
+        """
+        Plays the all-against-all tournament of one generation among the
+        alive individuals, or reads their expected points from
+        'self.payoff_matrix' if there is one.
+
+        Results:
+            - The 'tournament.ranking' of the generation
+        """
+        if self.payoff_matrix is None:
+            tournament = Tournament(tuple(self.ranking), self.n_rounds,
+                                    self.error, self.repetitions)
+            tournament.play(do_print=False)
+            return tournament.ranking
+
+        counts = self.count_strategies()
+        fitness = self.payoff_matrix.fitness(list(counts.values()),
+                                             self.repetitions)
+        index = {name: i for i, name in enumerate(counts)}
+        return {player: float(fitness[index[player.name]])
+                for player in self.ranking}
+
+
+    def play(self, do_print: bool = False) -> dict[str, list]:
         """
         Main call of the class. Performs the computations to simulate the
         evolutionary tournament.
@@ -97,6 +137,10 @@ class Evolution:
             - do_print (bool = False): if True, should print the ongoing
          results at the end of each generation (i.e. print generation number,
          and number of individuals playing each strategy).
+
+        Results:
+            - The 'count_evolution' dict described below, ready to be passed
+         to 'self.stackplot()'
         """
 
         # HINT: Initialise the following variable
@@ -111,32 +155,68 @@ class Evolution:
         #  'random': [5, 10, 15, 19, 14, 9, 4, 0, 0, 0, 0],
         #  'focal5': [5, 5, 5, 6, 11, 16, 21, 25, 25, 25, 25]}
 
-        raise NotImplementedError
+        count_evolution = {player.name: [val] for player, val in
+                           zip(self.players, self.initial_population)}
+
+        for generation in range(self.generations):
+            self.ranking = self.natural_selection(self.face_to_face())
+
+            counts = self.count_strategies()
+            for name, val in counts.items():
+                count_evolution[name].append(val)
+
+            if do_print:
+                print(f"Generation {generation + 1}: {counts}")
+
+        return count_evolution
 
     # Si quieres obtener un buen gráfico de la evolución, puedes usar este
     # método si has seguido la pista indicada en la cabecera del método
     # anterior. Ya está implementado, pero puede que necesites adaptarlo a tu
     # código.
-    def stackplot(self, count_evolution: dict[str, list]) -> None:
+    def stackplot(self, count_evolution: dict[str, list],
+                        bands: dict[str, tuple[list, list]] | None = None) -> None:
         """
-        Plots a 'stackplot' of the evolution of the tournament
-
-        Parameters:
-            - count_evolution (dict[Player, list]): a dictionary containing as
-         keys the name of the strategies of the different players of the
-         tournament. Each value is a list, where the 'i'-th position of that
-         list indicates the number of individuals that player has at the end of
-         the 'i'-th generation
-         """
-
-        COLORS = ['blue', 'green', 'red', 'cyan', 'magenta', 'yellow', 'black']
-
+        Plots a 'stackplot' of the evolution of the tournament (see
+        'plot_count_evolution')
+        """
+        plot_count_evolution(self.generations, count_evolution, bands)
+
+
+def plot_count_evolution(generations: int, count_evolution: dict[str, list],
+                         bands: dict[str, tuple[list, list]] | None = None) -> None:
+    """
+    Plots a 'stackplot' of the evolution of the tournament
+
+    Parameters:
+        - generations (int): number of generations simulated
+        - count_evolution (dict[Player, list]): a dictionary containing as
+     keys the name of the strategies of the different players of the
+     tournament. Each value is a list, where the 'i'-th position of that
+     list indicates the number of individuals that player has at the end of
+     the 'i'-th generation
+        - bands (dict[str, tuple[list, list]] | None = None): optional
+     lower and upper bounds of each strategy count (same keys and lengths
+     as 'count_evolution'), drawn as hatched bands around the top edge of
+     each layer of the stack
+    """
+
+    COLORS = ['blue', 'green', 'red', 'cyan', 'magenta', 'yellow', 'black']
+
+    for i, name in enumerate(count_evolution.keys()):
+        plt.plot([], [], label=name, color= COLORS[(i) % len(COLORS)])
+
+    steps = list(range(generations + 1))
+    counts = np.array(list(count_evolution.values()))
+    plt.stackplot(steps, counts, colors=COLORS)
+
+    if bands is not None:
+        baseline = np.cumsum(counts, axis=0) - counts
         for i, name in enumerate(count_evolution.keys()):
-            plt.plot([], [], label=name, color= COLORS[(i) % len(COLORS)])
-
-        plt.stackplot(list(range(self.generations + 1)),
-                      np.array(list(count_evolution.values())), colors=COLORS)
-
-        plt.legend()
-        plt.show()
+            low, high = bands[name]
+            plt.fill_between(steps, baseline[i] + np.array(low),
+                             baseline[i] + np.array(high), facecolor='none',
+                             edgecolor='gray', hatch='//', linewidth=0.0)
 
+    plt.legend()
+    plt.show()
@@ -0,0 +1,225 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Self
+import copy
+import os
+import weakref
+import numpy as np
+
+from .player import Player
+from .match import Match
+
+
+def _fill_pairs(name: str, players: tuple[Player, ...], n_rounds: int,
+                error: float, pairs: list[tuple[int, int]],
+                repetitions: int) -> None:
+    """Plays some pairs on a shared matrix attached by name (runs in a worker)"""
+    payoffs = PayoffMatrix(players, n_rounds, error, name=name)
+    try:
+        payoffs.play_pairs(pairs, repetitions)
+    finally:
+        payoffs.close()
+
+
+def _release(shm: shared_memory.SharedMemory) -> None:
+    """Frees the shared memory of a matrix nobody uses anymore"""
+    try:
+        shm.close()
+    except BufferError:
+        pass  # some array still points to it (at exit), unlinking is enough
+    shm.unlink()
+
+
+class PayoffMatrix:
+
+    def __init__(self, players: tuple[Player, ...],
+                       n_rounds: int = 100,
+                       error: float = 0.0,
+                       name: str | None = None):
+        """
+        Strategy-vs-strategy payoff matrix, stored in shared memory so that
+        several processes can fill it and every engine (tournaments,
+        evolution, analysis...) can read it instead of playing its own
+        matches. For each ordered pair of players (i, j) it keeps the number
+        of matches played, and the mean and variance of the points that the
+        'i'-th player obtained against the 'j'-th one.
+
+        Parameters:
+            - players (tuple[Player, ...]): tuple of players (strategies)
+            - n_rounds (int = 100): number of rounds in each match
+            - error (float = 0.0): error probability (in base 1)
+            - name (str | None = None): name of an existing shared matrix to
+         attach to. If None, a new one (filled with zeros) is created. Its
+         memory is freed when leaving a 'with' block, when calling 'unlink()',
+         or else when the matrix is garbage collected (or at exit)
+        """
+
+        self.players = players
+        self.n_rounds = n_rounds
+        self.error = error
+
+        n_players = len(self.players)
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=max(
+                3 * n_players * n_players * np.dtype(np.float64).itemsize, 1))
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+        self._finalizer = weakref.finalize(self, _release, self.shm) \
+                          if self.owner else None
+
+        self.data = np.ndarray((3, n_players, n_players), dtype=np.float64,
+                               buffer=self.shm.buf)
+        if self.owner:
+            self.data[:] = 0.0
+
+        # Views over the shared buffer: matches played, mean points and sum of
+        # squared deviations (Welford's online algorithm)
+        self.count = self.data[0]
+        self.mean = self.data[1]
+        self.m2 = self.data[2]
+
+
+    def check(self, players: tuple[Player, ...], n_rounds: int,
+                    error: float) -> None:
+        """
+        Asserts that this matrix can be read by an engine playing 'players'
+        (in that order) with the given match settings
+        """
+        assert [player.name for player in players] \
+            == [player.name for player in self.players], \
+            "the payoff matrix should have the same players, in the same order"
+        assert (n_rounds, error) == (self.n_rounds, self.error), \
+            "the payoff matrix was filled with other 'n_rounds' or 'error'"
+
+
+    @property
+    def variance(self) -> np.ndarray:
+        """Sample variance of the points of each ordered pair of players"""
+        return np.divide(self.m2, self.count - 1, out=np.zeros_like(self.m2),
+                         where=self.count > 1)
+
+
+    def add(self, i: int, j: int, score: float) -> None:
+        """
+        Adds the points the 'i'-th player obtained in a match against the
+        'j'-th one
+        """
+        self.count[i, j] += 1
+        delta = score - self.mean[i, j]
+        self.mean[i, j] += delta / self.count[i, j]
+        self.m2[i, j] += delta * (score - self.mean[i, j])
+
+
+    def play_pairs(self, pairs: list[tuple[int, int]], repetitions: int) -> None:
+        """
+        Plays 'repetitions' matches for each of the given pairs of indices,
+        adding both scores to the matrix
+        """
+        for i, j in pairs:
+            for _ in range(repetitions):
+                match = Match(copy.deepcopy(self.players[i]), copy.deepcopy(self.players[j]),
+                              self.n_rounds, self.error)
+                match.play()
+                self.add(i, j, match.score[0])
+                self.add(j, i, match.score[1])
+
+
+    def fill(self, repetitions: int = 2, n_workers: int | None = 1) -> None:
+        """
+        Plays 'repetitions' more matches for every pair of players (each
+        player against itself included). Can be called several times to
+        refine the estimates.
+
+        Parameters:
+            - repetitions (int = 2): number of matches per pair
+            - n_workers (int | None = 1): number of worker processes. If 1,
+         everything is played in the current process. If None, one per CPU
+        """
+        pairs = [(i, j) for i in range(len(self.players))
+                 for j in range(i, len(self.players))]
+
+        if n_workers == 1:
+            self.play_pairs(pairs, repetitions)
+            return
+
+        # Every pair goes to a single worker, so no two processes ever write
+        # the same cells and no lock is needed
+        n_workers = n_workers or os.cpu_count() or 1
+        n_chunks = min(4 * n_workers, len(pairs))
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            futures = [executor.submit(_fill_pairs, self.name, self.players,
+                                       self.n_rounds, self.error,
+                                       pairs[k::n_chunks], repetitions)
+                       for k in range(n_chunks)]
+            for future in futures:
+                future.result()
+
+
+    def ranking(self, repetitions: int = 2) -> dict[Player, float]:
+        """
+        Expected 'tournament.ranking' of an all-against-all tournament among
+        the players, with 'repetitions' matches per pair
+
+        Results:
+            - A dict with the players as keys and their expected points as
+         values, sorted by the points
+        """
+        points = repetitions * (self.mean.sum(axis=1) - np.diag(self.mean))
+        ranking = {player: float(val) for player, val in zip(self.players, points)}
+        return dict(sorted(ranking.items(), key=lambda item: item[1], reverse=True))
+
+
+    def fitness(self, population: np.ndarray, repetitions: int = 2) -> np.ndarray:
+        """
+        Expected points of one individual of each strategy in an
+        all-against-all tournament within a population
+
+        Parameters:
+            - population (np.ndarray): number of individuals of each strategy
+            - repetitions (int = 2): number of matches per pair of individuals
+
+        Results:
+            - A np array with the expected points of an individual of each
+         strategy (an individual does not play against itself)
+        """
+        population = np.asarray(population, dtype=np.float64)
+        return repetitions * (self.mean @ population - np.diag(self.mean))
+
+
+    def to_dict(self) -> dict[tuple[str, str], dict[str, float]]:
+        """
+        Exports the matrix as a dict, whose keys are the (player, opponent)
+        names and whose values contain the 'count', 'mean' and 'variance' of
+        the points of the player against that opponent
+        """
+        variance = self.variance
+        return {(player1.name, player2.name): {"count": int(self.count[i, j]),
+                                               "mean": float(self.mean[i, j]),
+                                               "variance": float(variance[i, j])}
+                for i, player1 in enumerate(self.players)
+                for j, player2 in enumerate(self.players)}
+
+
+    def close(self) -> None:
+        """Detaches from the shared memory (the arrays can't be used anymore)"""
+        del self.count, self.mean, self.m2, self.data
+        self.shm.close()
+
+
+    def unlink(self) -> None:
+        """Frees the shared memory. Only the creator should call it"""
+        if self._finalizer is not None:
+            self._finalizer.detach()
+        self.shm.unlink()
+
+
+    def __enter__(self) -> Self:
+        return self
+
+
+    def __exit__(self, *args) -> None:
+        self.close()
+        if self.owner:
+            self.unlink()
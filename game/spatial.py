@@ -0,0 +1,156 @@
+import numpy as np
+
+from .player import Player
+from .evolution import plot_count_evolution
+from .payoff import PayoffMatrix
+
+NEIGHBORHOODS = {
+    "moore": ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)),
+    "von_neumann": ((-1, 0), (0, -1), (0, 1), (1, 0)),
+}
+
+class SpatialEvolution:
+
+    def __init__(self, players: tuple[Player, ...],
+                       n_rounds: int = 100,
+                       error: float = 0.0,
+                       repetitions: int = 2,
+                       generations: int = 100,
+                       shape: tuple[int, int] = (100, 100),
+                       neighborhood: str = "moore",
+                       initial_population: tuple[float, ...] | np.ndarray | None = None,
+                       seed: int | None = None,
+                       payoff_matrix: PayoffMatrix | None = None):
+        """
+        Evolutionary tournament on a 2-D torus lattice. Each cell holds one
+        individual, which only plays against its neighbors and, at the end of
+        each generation, imitates the strategy of the neighbor (itself
+        included) that scored the most points. The lattice is stored as a
+        grid of strategy indices, and the points of each pair of strategies
+        are computed only once, before the first generation.
+
+        Parameters:
+            - players (tuple[Player, ...]): tuple of players (strategies) that
+         will populate the lattice
+            - n_rounds (int = 100): number of rounds in each match
+            - error (float = 0.0): error probability (in base 1)
+            - repetitions (int = 2): number of matches averaged to compute the
+         points of each pair of strategies
+            - generations (int = 100): number of generations to simulate
+            - shape (tuple[int, int] = (100, 100)): height and width of the
+         lattice
+            - neighborhood (str = "moore"): "moore" (8 neighbors) or
+         "von_neumann" (4 neighbors)
+            - initial_population (tuple[float, ...] | np.ndarray | None = None):
+         proportion of cells of each strategy (same index as 'players' tuple),
+         OR the initial grid of strategy indices itself (then 'shape' is
+         ignored). If None, every strategy gets the same proportion
+            - seed (int | None = None): seed of the initial random placement
+            - payoff_matrix (PayoffMatrix | None = None): an already filled
+         payoff matrix of the players (same order, 'n_rounds' and 'error'). If
+         None, one is filled before the first generation
+        """
+
+        assert neighborhood in NEIGHBORHOODS, \
+            f"'neighborhood' should be one of {tuple(NEIGHBORHOODS)}"
+        assert len(players) <= 256, "at most 256 strategies are supported"
+
+        self.players = players
+        self.n_rounds = n_rounds
+        self.error = error
+        self.repetitions = repetitions
+        self.generations = generations
+        self.offsets = NEIGHBORHOODS[neighborhood]
+
+        if isinstance(initial_population, np.ndarray):
+            assert initial_population.ndim == 2, \
+                "the initial grid should be a 2-D array"
+            assert np.issubdtype(initial_population.dtype, np.integer), \
+                "the initial grid should contain strategy indices"
+            assert ((initial_population >= 0)
+                    & (initial_population < len(self.players))).all(), \
+                "the initial grid values should be indices of 'players'"
+            self.grid = initial_population.astype(np.uint8)
+        else:
+            if initial_population is None:
+                initial_population = [1.0] * len(self.players)
+            weights = np.array(initial_population, dtype=float)
+            rng = np.random.default_rng(seed)
+            self.grid = rng.choice(len(self.players), size=shape,
+                                   p=weights / weights.sum()).astype(np.uint8)
+
+        if payoff_matrix is None:
+            with PayoffMatrix(self.players, self.n_rounds, self.error) as payoff_matrix:
+                payoff_matrix.fill(self.repetitions)
+                self.payoffs = payoff_matrix.mean.astype(np.float32)
+        else:
+            payoff_matrix.check(self.players, self.n_rounds, self.error)
+            self.payoffs = payoff_matrix.mean.astype(np.float32)
+
+
+    def scores(self) -> np.ndarray:
+        """Points obtained by each cell against its neighbors"""
+        scores = np.zeros(self.grid.shape, dtype=np.float32)
+        for shift in self.offsets:
+            scores += self.payoffs[self.grid, np.roll(self.grid, shift, axis=(0, 1))]
+        return scores
+
+
+    def step(self) -> None:
+        """
+        Advances one generation: every cell adopts the strategy of the best
+        scoring cell of its neighborhood (keeping its own one on ties)
+        """
+        scores = self.scores()
+        best_scores = scores.copy()
+        best_grid = self.grid.copy()
+        for shift in self.offsets:
+            neighbor_scores = np.roll(scores, shift, axis=(0, 1))
+            better = neighbor_scores > best_scores
+            np.copyto(best_scores, neighbor_scores, where=better)
+            np.copyto(best_grid, np.roll(self.grid, shift, axis=(0, 1)), where=better)
+        self.grid = best_grid
+
+
+    def count_strategies(self) -> dict[str, int]:
+        """
+        Counts the number of cells of each strategy in the lattice
+
+        Results:
+            - A dict, containing as keys the name of the players and as values
+         the number of cells they occupy
+        """
+        counts = np.bincount(self.grid.ravel(), minlength=len(self.players))
+        return {player.name: int(val) for player, val in zip(self.players, counts)}
+
+
+    def play(self, do_print: bool = False) -> dict[str, list]:
+        """
+        Main call of the class. Simulates the spatial evolutionary tournament.
+
+        Parameters
+            - do_print (bool = False): if True, prints the generation number
+         and the number of cells of each strategy at the end of each generation
+
+        Results:
+            - A 'count_evolution' dict like the one of 'Evolution.play', ready
+         to be passed to 'self.stackplot()'
+        """
+        count_evolution = {name: [val] for name, val in self.count_strategies().items()}
+
+        for generation in range(self.generations):
+            self.step()
+
+            counts = self.count_strategies()
+            for name, val in counts.items():
+                count_evolution[name].append(val)
+
+            if do_print:
+                print(f"Generation {generation + 1}: {counts}")
+
+        return count_evolution
+
+
+    def stackplot(self, count_evolution: dict[str, list]) -> None:
+        """Plots a 'stackplot' of the evolution (see 'plot_count_evolution')"""
+        plot_count_evolution(self.generations, count_evolution)
@@ -0,0 +1,238 @@
+from itertools import combinations
+import math
+import copy
+import numpy as np
+
+from .player import Player
+from .match import Match
+from .tournament import Tournament
+
+PAIRINGS = ("swiss", "elo")
+
+class SwissTournament(Tournament):
+
+    def __init__(self, players: tuple[Player, ...],
+                       n_rounds: int = 100,
+                       error: float = 0.0,
+                       repetitions: int = 2,
+                       swiss_rounds: int | None = None,
+                       pairing: str = "swiss",
+                       top_k: int = 8,
+                       k_factor: float = 32.0,
+                       initial_rating: float = 1500.0):
+        """
+        Swiss-system tournament for large fields. Instead of making every
+        player face every other one, players are paired over a few rounds
+        against opponents with a similar standing, and only the 'top_k' best
+        ones play a final all-against-all tournament.
+
+        Parameters:
+            - players (tuple[Player, ...]): tuple of players that will play the
+         tournament
+            - n_rounds (int = 100): number of rounds in each match
+            - error (float = 0.0): error probability (in base 1)
+            - repetitions (int = 2): number of matches played in each pairing
+            - swiss_rounds (int | None = None): number of pairing rounds. If
+         None, ceil(log2(number of players)) rounds are played
+            - pairing (str = "swiss"): "swiss" pairs players by their average
+         points per match, "elo" pairs them by their Elo rating
+            - top_k (int = 8): number of players that go to the final
+         all-against-all tournament
+            - k_factor (float = 32.0): Elo update step
+            - initial_rating (float = 1500.0): Elo rating of every player
+         before the first round
+        """
+
+        super().__init__(players, n_rounds, error, repetitions)
+
+        assert pairing in PAIRINGS, f"'pairing' should be one of {PAIRINGS}"
+
+        if swiss_rounds is None:
+            swiss_rounds = max(1, math.ceil(math.log2(max(len(players), 2))))
+
+        self.swiss_rounds = swiss_rounds
+        self.pairing = pairing
+        self.top_k = min(top_k, len(players))
+        self.k_factor = k_factor
+
+        self.points = {player: 0.0 for player in self.players}
+        self.matches = {player: 0 for player in self.players}
+        self.ratings = {player: initial_rating for player in self.players}
+        self.opponents = {player: set() for player in self.players}
+        self.byes = set()       # players that have already rested a round
+        self.last_bye = None    # player that rested in the last round
+        self.n_matches = 0  # number of matches actually simulated
+
+        # Final placing of the players, once 'play()' has been called:
+        # finalists sorted by their final tournament points, then the rest
+        # sorted by their Swiss standing. 'self.ranking' keeps the points.
+        self.standings = []
+
+
+    def standing(self, player: Player) -> float:
+        """
+        Key used to sort the players when pairing them. A player that has not
+        played yet gets the average points per match of the whole field, so it
+        is not ranked as if it had scored 0
+        """
+        if self.pairing == "elo":
+            return self.ratings[player]
+        if self.matches[player] == 0:
+            played = sum(self.matches.values())
+            return sum(self.points.values()) / played if played else 0.0
+        return self.points[player] / self.matches[player]
+
+
+    def pair_players(self) -> list[tuple[Player, Player]]:
+        """
+        Pairs every player with the closest one in the standings that it has
+        not faced yet (or just the closest one, if it already faced all the
+        remaining ones). If the number of players is odd, the lowest standing
+        player that has not rested yet (and did not rest last round) rests.
+
+        Results:
+            - A list of pairs of players
+        """
+        pending = sorted(self.players, key=self.standing, reverse=True)
+        if len(pending) % 2 and len(pending) > 1:
+            candidates = [player for player in pending
+                          if player is not self.last_bye]
+            if self.byes.issuperset(candidates):
+                self.byes.clear()  # everyone has rested, start a new cycle
+            bye = next(player for player in reversed(candidates)
+                       if player not in self.byes)
+            pending.remove(bye)
+            self.byes.add(bye)
+            self.last_bye = bye
+        else:
+            self.last_bye = None
+
+        pairs = []
+        while len(pending) > 1:
+            player = pending.pop(0)
+            rival = next((i for i, other in enumerate(pending)
+                          if other not in self.opponents[player]), 0)
+            pairs.append((player, pending.pop(rival)))
+        return pairs
+
+
+    def play_pairing(self, player1: Player, player2: Player) -> tuple[float, float]:
+        """
+        Plays 'self.repetitions' matches between two players, updating their
+        points and ratings.
+
+        Results:
+            - A tuple with the points obtained by each player
+        """
+        score_1 = 0.0
+        score_2 = 0.0
+        for _ in range(self.repetitions):
+            match = Match(copy.deepcopy(player1), copy.deepcopy(player2), self.n_rounds, self.error)
+            match.play()
+            score_1 += match.score[0]
+            score_2 += match.score[1]
+            self.n_matches += 1
+
+        self.points[player1] += score_1
+        self.points[player2] += score_2
+        self.matches[player1] += self.repetitions
+        self.matches[player2] += self.repetitions
+        self.opponents[player1].add(player2)
+        self.opponents[player2].add(player1)
+
+        expected = 1 / (1 + 10 ** ((self.ratings[player2] - self.ratings[player1]) / 400))
+        result = 0.5 if score_1 == score_2 else float(score_1 > score_2)
+        self.ratings[player1] += self.k_factor * (result - expected)
+        self.ratings[player2] -= self.k_factor * (result - expected)
+
+        return score_1, score_2
+
+
+    def play(self, do_print: bool = False) -> None:
+        """
+        Main call of the class. Plays the Swiss rounds and then the final
+        all-against-all tournament among the 'top_k' players. The placing is
+        stored in 'self.standings', and 'self.ranking' stores the average
+        points per match of every player (Swiss and final matches together).
+
+        Parameters
+            - do_print (bool = False): if True, prints the standings at the end
+         of each round.
+        """
+        for swiss_round in range(self.swiss_rounds):
+            for player1, player2 in self.pair_players():
+                self.play_pairing(player1, player2)
+            if do_print:
+                leader = max(self.players, key=self.standing)
+                print(f"Round {swiss_round + 1}: {self.n_matches} matches, "
+                      f"leader {leader.name} ({self.standing(leader):.2f})")
+
+        standings = sorted(self.players, key=self.standing, reverse=True)
+        finalists = standings[:self.top_k]
+
+        final = {player: 0.0 for player in finalists}
+        for player1, player2 in combinations(finalists, 2):
+            score_1, score_2 = self.play_pairing(player1, player2)
+            final[player1] += score_1
+            final[player2] += score_2
+
+        self.standings = sorted(finalists, key=final.get, reverse=True) \
+                         + standings[self.top_k:]
+        self.ranking = {player: self.points[player] / max(self.matches[player], 1)
+                        for player in self.players}
+        self.sort_ranking()
+        if do_print:
+            print([player.name for player in self.standings])
+
+
+    def round_robin_matches(self) -> int:
+        """Number of matches an all-against-all tournament would simulate"""
+        return math.comb(len(self.players), 2) * self.repetitions
+
+
+    def match_savings(self) -> float:
+        """Ratio (base 1) of matches saved compared to an all-against-all tournament"""
+        return 1 - self.n_matches / self.round_robin_matches()
+
+
+    def compare_with_round_robin(self, reference: Tournament | None = None) -> dict[str, float]:
+        """
+        Compares the final placing with the ranking of an all-against-all
+        tournament on the same players. Must be called after 'play()'.
+
+        Parameters:
+            - reference (Tournament | None = None): an already played
+         tournament with the same players. If None, a 'Tournament' with the
+         same settings is created and played (this is expensive on large
+         fields, as it plays every pairing).
+
+        Results:
+            - A dict with the number of matches of both tournaments, the
+         matches saved (base 1), the Spearman and Kendall rank correlations
+         between both rankings and the overlap (base 1) of their top 'top_k'
+         players.
+        """
+        if reference is None:
+            reference = Tournament(self.players, self.n_rounds, self.error, self.repetitions)
+            reference.play(do_print=False)
+            reference.sort_ranking()
+
+        position = {player: i for i, player in enumerate(reference.ranking)}
+        ranks = np.array([position[player] for player in self.standings], dtype=float)
+        expected = np.arange(len(ranks), dtype=float)
+
+        spearman = np.corrcoef(expected, ranks)[0, 1] if len(ranks) > 1 else 1.0
+        order = np.sign(expected[:, None] - expected[None, :]) \
+                * np.sign(ranks[:, None] - ranks[None, :])
+        n_pairs = len(ranks) * (len(ranks) - 1)
+        kendall = order.sum() / n_pairs if n_pairs else 1.0
+
+        top = set(self.standings[:self.top_k])
+        top_reference = set(list(reference.ranking)[:self.top_k])
+
+        return {"matches": self.n_matches,
+                "round_robin_matches": self.round_robin_matches(),
+                "savings": self.match_savings(),
+                "spearman": float(spearman),
+                "kendall": float(kendall),
+                "top_k_overlap": len(top & top_reference) / max(self.top_k, 1)}
@@ -4,6 +4,7 @@ import copy
 
 from .player import Player
 from .match import Match
+from .payoff import PayoffMatrix
 
 class Tournament:
 
@@ -11,7 +12,8 @@ class Tournament:
     def __init__(self, players: tuple[Player, ...],
                        n_rounds: int = 100,
                        error: float = 0.0,
-                       repetitions: int = 2):
+                       repetitions: int = 2,
+                       payoff_matrix: PayoffMatrix | None = None):
         """
         All-against-all tournament
 
@@ -22,12 +24,20 @@ class Tournament:
             - error (float = 0.0): error probability (in base 1)
             - repetitions (int = 2): number of matches each player plays against
          each other player
+            - payoff_matrix (PayoffMatrix | None = None): an already filled
+         payoff matrix of these players. If given, 'play()' reads the expected
+         points from it instead of simulating the matches. It must have been
+         filled with the same players (in the same order), 'n_rounds' and
+         'error'
         """
 
         self.players = players
         self.n_rounds = n_rounds
         self.error = error
         self.repetitions = repetitions
+        self.payoff_matrix = payoff_matrix
+        if self.payoff_matrix is not None:
+            self.payoff_matrix.check(self.players, self.n_rounds, self.error)
 
         # This is a key variable of the class. It is intended to store the
         # ongoing ranking of the tournament. It is a dictionary whose keys are
@@ -43,21 +53,36 @@ class Tournament:
         self.ranking = dict(sorted(self.ranking.items(), key=lambda item: item[1], reverse=True))
 
     #pista: utiliza 'itertools.combinations' para hacer los cruces
-    def play(self) -> None:
+    def play(self, do_print: bool = True) -> None:
         """
         Main call of the class. It must simulate the championship and update
         the variable 'self.ranking' with the accumulated points obtained by
         each player in their interactions.
+
+        Parameters
+            - do_print (bool = True): if True, prints each pairing and the
+         ongoing ranking after it has been played.
         """
+        if self.payoff_matrix is not None:
+            points = self.payoff_matrix.ranking(self.repetitions)
+            self.ranking = {player: points[matrix_player] for player, matrix_player
+                            in zip(self.players, self.payoff_matrix.players)}
+            self.sort_ranking()
+            if do_print:
+                print(self.ranking)
+            return
+
         for player1, player2 in combinations(self.players, 2):
-            print(f"Match between {player1.name} and {player2.name}")
+            if do_print:
+                print(f"Match between {player1.name} and {player2.name}")
             for _ in range(self.repetitions):
                 match = Match(copy.deepcopy(player1), copy.deepcopy(player2), self.n_rounds, self.error)
                 match.play()
                 self.ranking[player1] += match.score[0]
                 self.ranking[player2] += match.score[1]
             self.sort_ranking()
-            print(self.ranking)
+            if do_print:
+                print(self.ranking)
 
     def plot_results(self):
         """